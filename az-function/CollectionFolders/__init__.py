@@ -1,9 +1,11 @@
 import azure.functions as func
 from ..shared.common_proxy import proxy_request
+from ..shared.validators import require_param
 
 async def main(req: func.HttpRequest) -> func.HttpResponse:
     username = req.route_params.get("username")
-    if not username:
-        return func.HttpResponse(status_code=400, mimetype="application/json", body='{"error":"username is required"}')
+    err = require_param(req, "username")
+    if err is not None:
+        return err
     upstream_path = f"/users/{username}/collection/folders"
     return await proxy_request(req, "GET", upstream_path)
@@ -1,10 +1,15 @@
 import azure.functions as func
 from ..shared.common_proxy import proxy_request
+from ..shared.validators import require_int
+
+# Static error response, built once per worker
+_ERR_NOT_FOUND = func.HttpResponse(status_code=404, mimetype="application/json", body=b'{"error":"not_found"}')
 
 async def main(req: func.HttpRequest) -> func.HttpResponse:
     label_id = req.route_params.get("label_id")
-    if not label_id or not label_id.isdigit():
-        return func.HttpResponse(status_code=400, mimetype="application/json", body='{"error":"label_id must be an integer"}')
+    err = require_int(req, "label_id")
+    if err is not None:
+        return err
 
     sub = req.route_params.get("sub")
     if sub:
@@ -14,7 +19,7 @@ async def main(req: func.HttpRequest) -> func.HttpResponse:
             # Discogs has /labels/{id}/releases and /labels/{id}/sublabels
             upstream_path = f"/labels/{label_id}/sublabels"
         else:
-            return func.HttpResponse(status_code=404, mimetype="application/json", body='{"error":"not_found"}')
+            return _ERR_NOT_FOUND
     else:
         upstream_path = f"/labels/{label_id}"
 
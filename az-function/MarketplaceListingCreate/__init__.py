@@ -1,17 +1,22 @@
 import azure.functions as func
-import json
+import orjson
 from ..shared.common_proxy import proxy_request
 
 REQUIRED_FIELDS = ["release_id", "condition", "price"]
 
+_ERR_INVALID_JSON = func.HttpResponse(status_code=400, mimetype="application/json", body=b'{"error":"invalid_json"}')
+
 async def main(req: func.HttpRequest) -> func.HttpResponse:
     try:
-        data = json.loads(req.get_body() or b"{}")
-    except json.JSONDecodeError:
-        return func.HttpResponse(status_code=400, mimetype="application/json", body='{"error":"invalid_json"}')
+        data = orjson.loads(req.get_body() or b"{}")
+    except orjson.JSONDecodeError:
+        return _ERR_INVALID_JSON
+    if not isinstance(data, dict):
+        # A listing is a JSON object; 5 or "abc" parse fine but have no fields to check
+        return _ERR_INVALID_JSON
     missing = [f for f in REQUIRED_FIELDS if f not in data]
     if missing:
-        return func.HttpResponse(status_code=400, mimetype="application/json", body=f'{{"error":"missing_fields","fields":"{','.join(missing)}"}}')
+        return func.HttpResponse(status_code=400, mimetype="application/json", body=orjson.dumps({"error": "missing_fields", "fields": missing}))
     # Discogs expects POST to /marketplace/listings
     upstream_path = "/marketplace/listings"
     return await proxy_request(req, "POST", upstream_path)
@@ -1,19 +1,25 @@
 import azure.functions as func
 from ..shared.common_proxy import proxy_request
+from ..shared.validators import require_int
+
+# Static error response, built once per worker
+_ERR_NOT_FOUND = func.HttpResponse(status_code=404, mimetype="application/json", body=b'{"error":"not_found"}')
 
 async def main(req: func.HttpRequest) -> func.HttpResponse:
     master_id = req.route_params.get("master_id")
-    if not master_id or not master_id.isdigit():
-        return func.HttpResponse(status_code=400, mimetype="application/json", body='{"error":"master_id must be an integer"}')
+    err = require_int(req, "master_id")
+    if err is not None:
+        return err
 
     sub = req.route_params.get("sub")
     # Support /masters/{id} and /masters/{id}/versions
     if sub:
         # Only allow 'versions' as sub-path
         if sub.lower() != "versions":
-            return func.HttpResponse(status_code=404, mimetype="application/json", body='{"error":"not_found"}')
+            return _ERR_NOT_FOUND
         upstream_path = f"/masters/{master_id}/versions"
     else:
         upstream_path = f"/masters/{master_id}"
 
-    return await proxy_request(req, "GET", upstream_path)
+    # Only the master itself is revalidated; paginated versions listings aren't cached
+    return await proxy_request(req, "GET", upstream_path, use_etag_cache=not sub)
@@ -1,4 +1,6 @@
 import azure.functions as func
 
+_PONG = func.HttpResponse(status_code=200, mimetype="application/json", body=b'{"status":"ok"}')
+
 def main(req: func.HttpRequest) -> func.HttpResponse:
-    return func.HttpResponse(status_code=200, mimetype="application/json", body='{"status":"ok"}')
+    return _PONG
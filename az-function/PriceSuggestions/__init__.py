@@ -1,6 +1,9 @@
-import os
 import azure.functions as func
+from ..shared import auth, config
 from ..shared.common_proxy import proxy_request
+from ..shared.validators import require_int
+
+_ERR_TOKEN_MISSING = func.HttpResponse(status_code=401, mimetype="application/json", body=b'{"error":"unauthorized","reason":"discogs_token_missing"}')
 
 async def main(req: func.HttpRequest) -> func.HttpResponse:
     """Proxy price suggestions for a release.
@@ -8,15 +11,16 @@ async def main(req: func.HttpRequest) -> func.HttpResponse:
     We perform a lightweight pre-check to surface clearer messaging when the PAT is missing.
     """
     release_id = req.route_params.get("release_id")
-    if not release_id or not release_id.isdigit():
-        return func.HttpResponse(status_code=400, mimetype="application/json", body='{"error":"release_id must be an integer"}')
+    err = require_int(req, "release_id")
+    if err is not None:
+        return err
 
     # If the upstream would 401 due to missing auth token, give a local 401 with descriptive reason.
-    discogs_token = os.getenv("DISCOGS_TOKEN")
-    if not discogs_token:
-        return func.HttpResponse(status_code=401, mimetype="application/json", body='{"error":"unauthorized","reason":"discogs_token_missing"}')
-    if discogs_token.startswith("@Microsoft.KeyVault("):
-        return func.HttpResponse(status_code=503, mimetype="application/json", body='{"error":"secrets_unresolved","which":"DISCOGS_TOKEN"}')
+    cfg = config.CFG
+    if not cfg.discogs_token:
+        return _ERR_TOKEN_MISSING
+    if cfg.kv_token_unresolved:
+        return auth.SECRETS_UNRESOLVED
 
     upstream_path = f"/marketplace/price_suggestions/{release_id}"
     return await proxy_request(req, "GET", upstream_path)
@@ -1,9 +1,11 @@
 import azure.functions as func
 from ..shared.common_proxy import proxy_request
+from ..shared.validators import require_int
 
 async def main(req: func.HttpRequest) -> func.HttpResponse:
     release_id = req.route_params.get("release_id")
-    if not release_id or not release_id.isdigit():
-        return func.HttpResponse(status_code=400, mimetype="application/json", body='{"error":"release_id must be an integer"}')
+    err = require_int(req, "release_id")
+    if err is not None:
+        return err
     upstream_path = f"/releases/{release_id}"
-    return await proxy_request(req, "GET", upstream_path)
+    return await proxy_request(req, "GET", upstream_path, use_etag_cache=True)
@@ -2,10 +2,12 @@
 
 Currently exposes:
     proxy_request - unified HTTP forwarding with auth, retries, header propagation.
+    require_int / require_param - route-param validation with cached 400 responses.
 
 Additional helpers can be added here in the future (e.g., pagination normalization).
 """
 
 from .common_proxy import proxy_request  # re-export for convenience
+from .validators import require_int, require_param
 
-__all__ = ["proxy_request"]
\ No newline at end of file
+__all__ = ["proxy_request", "require_int", "require_param"]
\ No newline at end of file
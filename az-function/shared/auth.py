@@ -0,0 +1,47 @@
+import hmac
+import logging
+from typing import Optional
+
+import azure.functions as func
+
+from . import config
+
+logger = logging.getLogger("discogs_proxy")
+
+# Error bodies never vary, so each response is built once per worker
+_MISCONFIGURED = func.HttpResponse(status_code=503, mimetype="application/json", body=b'{"error":"server_misconfigured","reason":"x_api_key_missing"}')
+_AUTH_FAIL = func.HttpResponse(status_code=401, mimetype="application/json", body=b'{"error":"unauthorized","reason":"api_key_mismatch"}')
+# Public: handlers that pre-check the Discogs token return this same response
+SECRETS_UNRESOLVED = func.HttpResponse(status_code=503, mimetype="application/json", body=b'{"error":"secrets_unresolved","which":"DISCOGS_TOKEN"}')
+
+
+def _client_key_check(req: func.HttpRequest) -> Optional[func.HttpResponse]:
+    cfg = config.CFG
+    # Cheapest, configuration-only outcomes first
+    if cfg.disable_check:
+        return None
+    if not cfg.api_key:
+        # Configuration error: we intended to enforce a client key but the env var is absent.
+        return _MISCONFIGURED
+    if cfg.kv_api_unresolved:
+        # Key Vault reference not resolved yet; there is nothing meaningful to compare against
+        return None
+    provided_key = (req.headers.get("x-api-key") or "").strip()
+    if hmac.compare_digest(provided_key.encode(), cfg.api_key.encode()):
+        return None
+    logger.warning("api_key_mismatch", extra={"key_provided": bool(provided_key)})
+    return _AUTH_FAIL
+
+
+def check(req: func.HttpRequest) -> Optional[func.HttpResponse]:
+    """Run the client key and Discogs token checks.
+
+    Returns None when the request may be forwarded, otherwise the error response.
+    """
+    err = _client_key_check(req)
+    if err is not None:
+        return err
+    if config.CFG.kv_token_unresolved:
+        logger.warning("secrets_unresolved", extra={"which": "DISCOGS_TOKEN"})
+        return SECRETS_UNRESOLVED
+    return None
@@ -1,41 +1,170 @@
-import os
+import itertools
 import logging
+import secrets
 import httpx
+import orjson
 import time
 import asyncio
-import uuid
-from typing import Dict, Optional
+import random
+import re
+from typing import Dict, Mapping, Optional, Tuple
 
 import azure.functions as func
 
+from . import auth, config
+from .etag_cache import CachedResponse, cache as etag_cache
+from .http_client import get_client
+
 logger = logging.getLogger("discogs_proxy")
 
-DISCOGS_BASE_URL = "https://api.discogs.com"
+# Trace ids are a random per-worker prefix plus a counter: unique enough to correlate
+# logs with X-Trace-Id, without reading os.urandom on every request
+_WORKER_ID = secrets.token_hex(4)
+_trace_seq = itertools.count(1)
+
+MAX_ATTEMPTS = 3
+_BODY_METHODS = frozenset(("POST", "PUT", "PATCH"))
+# Retry delay: RETRY_BASE_S * 2^n, stretched by up to RETRY_JITTER, capped at RETRY_CAP_S
+RETRY_BASE_S = 0.25
+RETRY_JITTER = 0.5
+RETRY_CAP_S = 30.0
+
+# Upstream response headers passed through to the caller, keyed by lower-case name
+_FORWARD_HEADERS = {
+    h.lower(): h
+    for h in (
+        "Link",
+        "X-Discogs-Ratelimit",
+        "X-Discogs-Ratelimit-Used",
+        "X-Discogs-Ratelimit-Remaining",
+        "X-Discogs-Ratelimit-Reset",
+        "ETag",
+    )
+}
+
+
+# JSON string values beginning with a Discogs API URL, e.g. "https://api.discogs.com/releases/1"
+_DISCOGS_HTTPS = b'"https://api.discogs.com/'
+_DISCOGS_HTTP = b'"http://api.discogs.com/'
+# Common tail of both prefixes: one scan decides whether either replace can match
+_DISCOGS_HOST = b'://api.discogs.com/'
+# An opening quote is never preceded by a backslash in JSON, but an escaped quote inside
+# free text ("see \"https://api.discogs.com/...\"") always is; such text must stay as is
+_ESCAPED_URL_QUOTE = b'\\"http'
+_DISCOGS_URL_RE = re.compile(rb'(?<!\\)"https?://api\.discogs\.com/')
+
+
+# Replacement bytes per Host header; a worker normally serves one host
+_PROXY_BASE_CACHE: Dict[Optional[str], bytes] = {}
+_PROXY_BASE_CACHE_MAX = 64
+
+
+def _proxy_base_for(host: Optional[str]) -> bytes:
+    base = _PROXY_BASE_CACHE.get(host)
+    if base is None:
+        # JSON-encode (then drop the closing quote) so a '"' or '\' in Host can't break the body
+        base = orjson.dumps(f"https://{host}/api/")[:-1]
+        if len(_PROXY_BASE_CACHE) >= _PROXY_BASE_CACHE_MAX:
+            # FIFO eviction: dicts keep insertion order
+            del _PROXY_BASE_CACHE[next(iter(_PROXY_BASE_CACHE))]
+        _PROXY_BASE_CACHE[host] = base
+    return base
+
 
+class _LazyJson:
+    """Defer JSON serialization until a log handler actually formats the record."""
 
-def _build_auth_headers() -> Dict[str, str]:
-    discogs_token = os.getenv("DISCOGS_TOKEN")
-    user_agent = os.getenv("USER_AGENT", "DiscogsAgent/0.1")
-    headers = {"User-Agent": user_agent, "Accept": "application/json"}
-    if discogs_token:
-        headers["Authorization"] = f"Discogs token={discogs_token}"
-    return headers
+    __slots__ = ("d",)
+
+    def __init__(self, d):
+        self.d = d
+
+    def __str__(self) -> str:
+        return orjson.dumps(self.d).decode()
+
+
+def _sanitize_headers(h: Mapping[str, str]) -> Dict[str, str]:
+    masked = {}
+    for k, v in h.items():
+        kl = k.lower()
+        if kl in ("authorization", "x-api-key", "cookie"):
+            masked[k] = "***"
+        else:
+            masked[k] = v
+    return masked
+
+
+def _emit_debug_request(
+    method: str,
+    upstream_path: str,
+    query: Optional[Dict[str, str]],
+    req_headers: Mapping[str, str],
+    **correlation: Optional[str],
+) -> None:
+    try:
+        debug_payload = {
+            "method": method,
+            "upstream_path": upstream_path,
+            "query": dict(query) if query else {},
+            "headers": _sanitize_headers(req_headers) if req_headers else {},
+        }
+        # Only include correlation fields if present
+        debug_payload.update((k, v) for k, v in correlation.items() if v)
+        logger.info("http_request_debug: %s", _LazyJson(debug_payload))
+    except Exception:
+        # Never fail the request due to debug logging
+        pass
 
 
-def _client_key_check(req: func.HttpRequest) -> Optional[func.HttpResponse]:
-    provided_key = req.headers.get("x-api-key")
-    expected_key = os.getenv("X_API_KEY")
-    disable_check = os.getenv("DISABLE_CLIENT_KEY_CHECK", "false").lower() == "true"
-    provided_key = provided_key.strip() if provided_key else provided_key
-    expected_key = expected_key.strip() if expected_key else expected_key
-    if not disable_check and not expected_key:
-        # Configuration error: we intended to enforce a client key but the env var is absent.
-        return func.HttpResponse(status_code=503, mimetype="application/json", body='{"error":"server_misconfigured","reason":"x_api_key_missing"}')
-    ref_unresolved = bool(expected_key) and expected_key.startswith("@Microsoft.KeyVault(")
-    mismatch = bool(expected_key) and provided_key != expected_key and not ref_unresolved and not disable_check
-    if mismatch:
-        return func.HttpResponse(status_code=401, mimetype="application/json", body='{"error":"unauthorized","reason":"api_key_mismatch"}')
-    return None
+def _traced(prefix: bytes, trace_id: str) -> bytes:
+    # prefix is a precomputed '{..."trace_id":"' fragment; trace ids are hex and '-' only
+    return b"".join((prefix, trace_id.encode(), b'"}'))
+
+
+def _error_body(error: str, trace_id: str, exc: Exception) -> bytes:
+    if not config.CFG.debug_errors:
+        return _traced(b'{"error":"%s","trace_id":"' % error.encode(), trace_id)
+    # orjson escapes quotes/newlines in exception text that an f-string would not
+    return orjson.dumps({"error": error, "trace_id": trace_id, "detail": str(exc)})
+
+
+async def _do_call(
+    method: str,
+    upstream_path: str,
+    headers: Optional[Dict[str, str]],
+    query: Optional[Dict[str, str]],
+    body: Optional[bytes],
+    allow_retry: bool,
+) -> Tuple[Optional[httpx.Response], Optional[httpx.RequestError]]:
+    """Send the upstream request, retrying transient failures.
+
+    Returns ``(resp, None)`` or, once retries are exhausted, ``(None, err)`` so the
+    caller can map timeouts and connection errors without unwinding an exception.
+    """
+    client = await get_client()
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return await client.request(method, upstream_path, headers=headers, params=query, content=body), None
+        except asyncio.CancelledError:
+            # Caller went away; never retry on behalf of a dead task
+            raise
+        except httpx.RequestError as rerr:
+            # TimeoutException and ReadError are both RequestError subclasses
+            if not allow_retry or attempt >= MAX_ATTEMPTS:
+                return None, rerr
+            # Exponential backoff with jitter so concurrent workers don't retry in lockstep
+            backoff = min(RETRY_CAP_S, RETRY_BASE_S * (2 ** (attempt - 1)) * (1 + random.random() * RETRY_JITTER))
+            # Logged inline so the line keeps this invocation's operation_Id; retries are rare
+            # and followed by a sleep, so the write costs nothing that matters
+            error_type = type(rerr).__name__
+            logger.warning(
+                "transient_retry path=%s attempt=%d backoff_s=%.2f error_type=%s",
+                upstream_path, attempt, backoff, error_type,
+                extra={"path": upstream_path, "attempt": attempt, "backoff_s": backoff, "error_type": error_type},
+            )
+            await asyncio.sleep(backoff)
 
 
 async def proxy_request(
@@ -43,144 +172,131 @@ async def proxy_request(
     method: str,
     upstream_path: str,
     allow_retry: Optional[bool] = None,
+    use_etag_cache: bool = False,
 ) -> func.HttpResponse:
-    # Optional request debugging (disabled by default).
-    debug_req = os.getenv("DEBUG_REQUEST_LOG", "false").lower() == "true"
-    def _sanitize_headers(h: Dict[str, str]) -> Dict[str, str]:
-        masked = {}
-        for k, v in h.items():
-            kl = k.lower()
-            if kl in ("authorization", "x-api-key", "cookie"):
-                masked[k] = "***"
-            else:
-                masked[k] = v
-        return masked
-
-    maybe_res = _client_key_check(req)
-    if maybe_res is not None:
-        return maybe_res
-
-    discogs_token = os.getenv("DISCOGS_TOKEN")
-    if bool(discogs_token) and discogs_token.startswith("@Microsoft.KeyVault("):
-        logger.warning("secrets_unresolved", extra={"which": "DISCOGS_TOKEN"})
-        return func.HttpResponse(status_code=503, mimetype="application/json", body='{"error":"secrets_unresolved","which":"DISCOGS_TOKEN"}')
-
-    headers = _build_auth_headers()
+    if (err := auth.check(req)) is not None:
+        return err
+
+    method = method.upper()
+
+    # Functions request headers are case-insensitive (stored lower-case), so one lookup per name
+    req_headers = req.headers
 
     # Client-provided correlation IDs and operation hash (if any from caller)
-    x_client_trace = req.headers.get("X-Client-Trace-Id") or req.headers.get("x-client-trace-id")
-    x_op_hash = (
-        req.headers.get("X-Operation-Hash")
-        or req.headers.get("x-operation-hash")
-        or req.headers.get("X-Action-Operation-Hash")
-        or req.headers.get("x-action-operation-hash")
-    )
+    x_client_trace = req_headers.get("x-client-trace-id")
+    x_op_hash = req_headers.get("x-operation-hash") or req_headers.get("x-action-operation-hash")
     # OpenAI Action-specific contextual headers (if present)
-    openai_conversation_id = req.headers.get("openai-conversation-id")
-    openai_ephemeral_user_id = req.headers.get("openai-ephemeral-user-id")
-    traceparent = req.headers.get("traceparent")
-
-    if_none_match = req.headers.get("If-None-Match")
-    if if_none_match:
-        headers["If-None-Match"] = if_none_match
+    openai_conversation_id = req_headers.get("openai-conversation-id")
+    openai_ephemeral_user_id = req_headers.get("openai-ephemeral-user-id")
+    traceparent = req_headers.get("traceparent")
 
-    content_type = req.headers.get("Content-Type")
-    if content_type:
-        headers["Content-Type"] = content_type
+    # User-Agent, Accept and Authorization are set once on the shared client, so only
+    # per-request extras go here; most GETs have none and send no headers dict at all
+    headers: Optional[Dict[str, str]] = None
+    if_none_match = req_headers.get("if-none-match")
+    content_type = req_headers.get("content-type")
+    if if_none_match or content_type:
+        headers = {}
+        if if_none_match:
+            headers["If-None-Match"] = if_none_match
+        if content_type:
+            headers["Content-Type"] = content_type
 
     # Build and normalize query string
-    query = dict(req.params) if req.params else {}
-    # Support 'query' alias by mapping to Discogs 'q'
-    if 'query' in query and 'q' not in query:
-        query['q'] = query['query']
-        del query['query']
-    url = f"{DISCOGS_BASE_URL}{upstream_path}"
+    query = dict(req.params) if req.params else None
+    # Support 'query' alias by mapping to Discogs 'q'; a single pop when there is no alias
+    if query and "q" not in query:
+        val = query.pop("query", None)
+        if val is not None:
+            query["q"] = val
 
     if allow_retry is None:
-        allow_retry = method.upper() in ("GET", "HEAD")
+        allow_retry = method in ("GET", "HEAD")
 
-    trace_id = str(uuid.uuid4())
-    started = time.perf_counter()
-    attempt = 0
+    # Revalidate a cached copy upstream unless the caller is doing its own conditional GET
+    cache_key = None
+    cached: Optional[CachedResponse] = None
+    if use_etag_cache and not if_none_match and method == "GET":
+        cache_key = (upstream_path, tuple(sorted(query.items())) if query else ())
+        cached = etag_cache.get(cache_key)
+        if cached is not None:
+            if headers is None:
+                headers = {}
+            headers["If-None-Match"] = cached.etag
+
+    trace_id = f"{_WORKER_ID}-{next(_trace_seq):08x}"
+    # Skip timing and telemetry assembly entirely when INFO is filtered out
+    emit_telemetry = logger.isEnabledFor(logging.INFO)
+    started = time.perf_counter() if emit_telemetry else 0.0
     try:
-        if debug_req:
-            try:
-                debug_payload = {
-                    "method": method.upper(),
-                    "upstream_path": upstream_path,
-                    "query": dict(query) if query else {},
-                    "headers": _sanitize_headers(dict(req.headers) if req.headers else {}),
-                }
-                # Only include correlation fields if present
-                if x_client_trace:
-                    debug_payload["x_client_trace_id"] = x_client_trace
-                if x_op_hash:
-                    debug_payload["x_operation_hash"] = x_op_hash
-                if openai_conversation_id:
-                    debug_payload["openai_conversation_id"] = openai_conversation_id
-                if openai_ephemeral_user_id:
-                    debug_payload["openai_ephemeral_user_id"] = openai_ephemeral_user_id
-                if traceparent:
-                    debug_payload["traceparent"] = traceparent
-                logger.info("http_request_debug: " + str(debug_payload).replace("'", '"'))
-            except Exception:
-                # Never fail the request due to debug logging
-                pass
-        while True:
-            attempt += 1
-            try:
-                def _do_sync():
-                    with httpx.Client(timeout=10) as client:
-                        if method.upper() in ("POST", "PUT", "PATCH", "DELETE"):
-                            body = req.get_body()
-                            return client.request(method.upper(), url, headers=headers, params=query, content=body)
-                        else:
-                            return client.request(method.upper(), url, headers=headers, params=query)
-
-                resp = await asyncio.to_thread(_do_sync)
-                break
-            except (httpx.TimeoutException, httpx.RequestError) as rerr:
-                if not allow_retry or attempt >= 2:
-                    raise
-                backoff = 0.25 * attempt
-                logger.warning("transient_retry", extra={"path": upstream_path, "attempt": attempt, "backoff_s": backoff, "error_type": type(rerr).__name__})
-                await asyncio.sleep(backoff)
-
-        elapsed_ms = (time.perf_counter() - started) * 1000
+        # Optional request debugging (disabled by default); a single flag check when off
+        if config.CFG.debug_req:
+            _emit_debug_request(
+                method,
+                upstream_path,
+                query,
+                req_headers,
+                x_client_trace_id=x_client_trace,
+                x_operation_hash=x_op_hash,
+                openai_conversation_id=openai_conversation_id,
+                openai_ephemeral_user_id=openai_ephemeral_user_id,
+                traceparent=traceparent,
+            )
+        # Read once, outside the retry loop; Discogs DELETEs carry no body
+        body = req.get_body() if method in _BODY_METHODS else None
+        resp, call_err = await _do_call(method, upstream_path, headers, query, body, allow_retry)
+        if call_err is not None:
+            # Expected network failures: no traceback capture, just a warning per failed call
+            extra = {"path": upstream_path, "error_type": type(call_err).__name__}
+            if isinstance(call_err, httpx.TimeoutException):
+                logger.warning("Timeout contacting Discogs", extra=extra)
+                return func.HttpResponse(status_code=504, mimetype="application/json", body=_error_body("timeout", trace_id, call_err))
+            logger.warning("RequestError contacting Discogs", extra=extra)
+            return func.HttpResponse(status_code=502, mimetype="application/json", body=_error_body("bad_gateway", trace_id, call_err))
+
         status = resp.status_code
 
-        telemetry = {
-            "event": "discogs_proxy_call",
-            "entity": upstream_path,
-            "method": method.upper(),
-            "status": status,
-            "elapsed_ms": round(elapsed_ms, 2),
-            "trace_id": trace_id,
+        # Failures are always logged; successful calls honour TELEMETRY_SAMPLE_RATE
+        sample_rate = 1.0 if status >= 400 else min(1.0, config.CFG.telemetry_sample_rate)
+        if emit_telemetry and (sample_rate >= 1.0 or random.random() < sample_rate):
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            record = {
+                "event": "discogs_proxy_call",
+                "entity": upstream_path,
+                "method": method,
+                "status": status,
+                "elapsed_ms": round(elapsed_ms, 2),
+                "trace_id": trace_id,
+                # Lets queries weight each line by 1/sample_rate to recover call counts and averages
+                "sample_rate": sample_rate,
+            }
+            if x_client_trace:
+                record["x_client_trace_id"] = x_client_trace
+            if x_op_hash:
+                record["x_operation_hash"] = x_op_hash
+            if openai_conversation_id:
+                record["openai_conversation_id"] = openai_conversation_id
+            if openai_ephemeral_user_id:
+                record["openai_ephemeral_user_id"] = openai_ephemeral_user_id
+            if traceparent:
+                record["traceparent"] = traceparent
+            # Logged inline so the line carries this invocation's operation_Id
+            logger.info("discogs_proxy: %s", _LazyJson(record))
+
+        # One pass over the upstream headers instead of a case-insensitive lookup per name;
+        # later branches read ETag and rate-limit values from here too
+        hdrs: Dict[str, str] = {
+            name: v for k, v in resp.headers.items() if v and (name := _FORWARD_HEADERS.get(k.lower()))
         }
-        if x_client_trace:
-            telemetry["x_client_trace_id"] = x_client_trace
-        if x_op_hash:
-            telemetry["x_operation_hash"] = x_op_hash
-        if openai_conversation_id:
-            telemetry["openai_conversation_id"] = openai_conversation_id
-        if openai_ephemeral_user_id:
-            telemetry["openai_ephemeral_user_id"] = openai_ephemeral_user_id
-        if traceparent:
-            telemetry["traceparent"] = traceparent
-        logger.info("discogs_proxy: " + str(telemetry).replace("'", '"'))
-
-        hdrs: Dict[str, str] = {}
-        for h in [
-            "Link",
-            "X-Discogs-Ratelimit",
-            "X-Discogs-Ratelimit-Used",
-            "X-Discogs-Ratelimit-Remaining",
-            "X-Discogs-Ratelimit-Reset",
-            "ETag",
-        ]:
-            v = resp.headers.get(h)
-            if v:
-                hdrs[h] = v
+
+        upstream_type = resp.headers.get("Content-Type", "application/json")
+        content = resp.content
+        if cached is not None and status == 304:
+            # Discogs confirmed our copy is current; serve it as a normal 200
+            status, content, upstream_type = 200, cached.content, cached.content_type
+        elif cache_key is not None and status == 200 and (etag := hdrs.get("ETag")):
+            etag_cache.put(cache_key, CachedResponse(etag, content, upstream_type))
+
         # Add our correlation id to the response for easy log correlation
         hdrs["X-Trace-Id"] = trace_id
         if x_client_trace:
@@ -192,60 +308,33 @@ async def proxy_request(
             return func.HttpResponse(status_code=304, headers=hdrs)
 
         if 200 <= status < 300:
-            mimetype = resp.headers.get("Content-Type", "application/json").split(";")[0]
-            # Optionally rewrite api.discogs.com URLs to our proxy host for better action chaining
-            if mimetype == "application/json":
-                try:
-                    do_rewrite = os.getenv("REWRITE_UPSTREAM_URLS", "true").lower() == "true"
-                    if do_rewrite:
-                        import json
-
-                        proxy_base = f"https://{req.headers.get('host')}/api"
-
-                        def _rewrite(obj):
-                            if isinstance(obj, dict):
-                                return {k: _rewrite(v) for k, v in obj.items()}
-                            if isinstance(obj, list):
-                                return [_rewrite(v) for v in obj]
-                            if isinstance(obj, str):
-                                if obj.startswith("https://api.discogs.com/"):
-                                    return proxy_base + obj[len("https://api.discogs.com"):]
-                                if obj.startswith("http://api.discogs.com/"):
-                                    return proxy_base + obj[len("http://api.discogs.com"):]
-                                return obj
-                            return obj
-
-                        data = resp.json()
-                        data = _rewrite(data)
-                        body_bytes = json.dumps(data, ensure_ascii=False).encode("utf-8")
-                        return func.HttpResponse(status_code=status, mimetype=mimetype, body=body_bytes, headers=hdrs)
-                except Exception:
-                    # If rewrite fails for any reason, fall back to original content
-                    pass
-            return func.HttpResponse(status_code=status, mimetype=mimetype, body=resp.content, headers=hdrs)
+            if not content:
+                # 204/202 and HEAD carry no body: nothing to rewrite or label with a mimetype
+                return func.HttpResponse(status_code=status, headers=hdrs)
+            mimetype = upstream_type.split(";")[0]
+            # Optionally rewrite api.discogs.com URLs to our proxy host for better action chaining.
+            # Done on the raw bytes: only string values that start with the Discogs API URL match,
+            # so there is no need to parse, walk and re-serialize the whole payload. bytes.replace
+            # is a plain C-level scan, cheaper than a regex substitution.
+            if mimetype == "application/json" and config.CFG.rewrite_urls and _DISCOGS_HOST in content:
+                proxy_base = _proxy_base_for(req_headers.get("host"))
+                if _ESCAPED_URL_QUOTE in content:
+                    # Rare: a quoted URL inside free text; the regex skips backslash-escaped quotes
+                    content = _DISCOGS_URL_RE.sub(lambda _m: proxy_base, content)
+                else:
+                    content = content.replace(_DISCOGS_HTTPS, proxy_base).replace(_DISCOGS_HTTP, proxy_base)
+            return func.HttpResponse(status_code=status, mimetype=mimetype, body=content, headers=hdrs)
         if status == 404:
-            return func.HttpResponse(status_code=404, mimetype="application/json", body=f'{{"error":"not_found","trace_id":"{trace_id}"}}')
+            return func.HttpResponse(status_code=404, mimetype="application/json", body=_traced(b'{"error":"not_found","trace_id":"', trace_id))
         if status == 429:
-            rl_reset = resp.headers.get("X-Discogs-Ratelimit-Reset")
-            rl_rem = resp.headers.get("X-Discogs-Ratelimit-Remaining")
-            rl = resp.headers.get("X-Discogs-Ratelimit")
+            rl_reset = hdrs.get("X-Discogs-Ratelimit-Reset")
+            rl_rem = hdrs.get("X-Discogs-Ratelimit-Remaining")
+            rl = hdrs.get("X-Discogs-Ratelimit")
             body = {"error": "rate_limited", "trace_id": trace_id, "limit": rl, "remaining": rl_rem, "reset": rl_reset}
-            return func.HttpResponse(status_code=429, mimetype="application/json", body=str(body).replace("'", '"'))
+            return func.HttpResponse(status_code=429, mimetype="application/json", body=orjson.dumps(body))
         if 500 <= status < 600:
-            return func.HttpResponse(status_code=502, mimetype="application/json", body=f'{{"error":"upstream_error","upstream_status":{status},"trace_id":"{trace_id}"}}')
-        return func.HttpResponse(status_code=status, mimetype="application/json", body=f'{{"error":"unexpected_status","upstream_status":{status},"trace_id":"{trace_id}"}}')
-    except httpx.TimeoutException as e:
-        logger.warning("Timeout contacting Discogs", extra={"path": upstream_path})
-        debug_errors = os.getenv("DEBUG_ERRORS", "false").lower() == "true"
-        msg = f',"detail":"{str(e)}"' if debug_errors else ""
-        return func.HttpResponse(status_code=504, mimetype="application/json", body=f'{{"error":"timeout","trace_id":"{trace_id}"{msg}}}')
-    except httpx.RequestError as e:
-        logger.exception("RequestError contacting Discogs", extra={"path": upstream_path})
-        debug_errors = os.getenv("DEBUG_ERRORS", "false").lower() == "true"
-        msg = f',"detail":"{str(e)}"' if debug_errors else ""
-        return func.HttpResponse(status_code=502, mimetype="application/json", body=f'{{"error":"bad_gateway","trace_id":"{trace_id}"{msg}}}')
+            return func.HttpResponse(status_code=502, mimetype="application/json", body=_traced(b'{"error":"upstream_error","upstream_status":%d,"trace_id":"' % status, trace_id))
+        return func.HttpResponse(status_code=status, mimetype="application/json", body=_traced(b'{"error":"unexpected_status","upstream_status":%d,"trace_id":"' % status, trace_id))
     except Exception as e:
         logger.exception("Unexpected error contacting Discogs", extra={"path": upstream_path})
-        debug_errors = os.getenv("DEBUG_ERRORS", "false").lower() == "true"
-        msg = f',"detail":"{str(e)}"' if debug_errors else ""
-        return func.HttpResponse(status_code=500, mimetype="application/json", body=f'{{"error":"internal_error","trace_id":"{trace_id}"{msg}}}')
+        return func.HttpResponse(status_code=500, mimetype="application/json", body=_error_body("internal_error", trace_id, e))
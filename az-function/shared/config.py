@@ -0,0 +1,83 @@
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+KEYVAULT_REF_PREFIX = "@Microsoft.KeyVault("
+
+
+@dataclass(frozen=True)
+class Cfg:
+    """Proxy settings read once per worker from app settings / local.settings.json."""
+
+    api_key: str
+    disable_check: bool
+    discogs_token: str
+    user_agent: str
+    debug_errors: bool
+    debug_req: bool
+    rewrite_urls: bool
+    # Fraction of successful upstream calls that emit a discogs_proxy trace (0.0-1.0)
+    telemetry_sample_rate: float
+    # Max upstream bodies kept for If-None-Match revalidation (0 disables)
+    etag_cache_size: int
+    # True when Functions has not (yet) resolved a Key Vault reference
+    kv_api_unresolved: bool
+    kv_token_unresolved: bool
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _load() -> Cfg:
+    api_key = os.getenv("X_API_KEY", "").strip()
+    discogs_token = os.getenv("DISCOGS_TOKEN", "").strip()
+    return Cfg(
+        api_key=api_key,
+        disable_check=os.getenv("DISABLE_CLIENT_KEY_CHECK", "false").lower() == "true",
+        discogs_token=discogs_token,
+        user_agent=os.getenv("USER_AGENT", "DiscogsAgent/0.1"),
+        debug_errors=os.getenv("DEBUG_ERRORS", "false").lower() == "true",
+        debug_req=os.getenv("DEBUG_REQUEST_LOG", "false").lower() == "true",
+        rewrite_urls=os.getenv("REWRITE_UPSTREAM_URLS", "true").lower() == "true",
+        telemetry_sample_rate=_float_env("TELEMETRY_SAMPLE_RATE", 1.0),
+        etag_cache_size=_int_env("ETAG_CACHE_SIZE", 256),
+        kv_api_unresolved=api_key.startswith(KEYVAULT_REF_PREFIX),
+        kv_token_unresolved=discogs_token.startswith(KEYVAULT_REF_PREFIX),
+    )
+
+
+def _base_headers(cfg: Cfg) -> Mapping[str, str]:
+    headers = {"User-Agent": cfg.user_agent, "Accept": "application/json"}
+    if cfg.discogs_token:
+        headers["Authorization"] = f"Discogs token={cfg.discogs_token}"
+    # Read-only view: shared by every request, so nobody may mutate it in place
+    return MappingProxyType(headers)
+
+
+CFG = _load()
+# Headers sent on every upstream call; installed as the shared client's defaults
+BASE_HEADERS = _base_headers(CFG)
+
+
+def refresh_config() -> Cfg:
+    """Re-read the environment, e.g. from tests that patch os.environ.
+
+    Callers must read ``config.CFG`` through the module so they see the refresh.
+    An already-created shared HTTP client keeps its headers until it is closed.
+    """
+    global CFG, BASE_HEADERS
+    CFG = _load()
+    BASE_HEADERS = _base_headers(CFG)
+    return CFG
@@ -0,0 +1,41 @@
+from collections import OrderedDict
+from typing import Hashable, NamedTuple, Optional
+
+from . import config
+
+
+class CachedResponse(NamedTuple):
+    etag: str
+    content: bytes
+    content_type: str
+
+
+class EtagCache:
+    """Small LRU of upstream bodies keyed by request, revalidated with If-None-Match."""
+
+    def __init__(self, maxsize: Optional[int] = None) -> None:
+        # None: follow config.CFG.etag_cache_size, re-read on each put so refresh_config() applies
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        entry = self._data.get(key)
+        if entry is not None:
+            self._data.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, entry: CachedResponse) -> None:
+        maxsize = config.CFG.etag_cache_size if self.maxsize is None else self.maxsize
+        if maxsize <= 0:
+            self._data.clear()
+            return
+        self._data[key] = entry
+        self._data.move_to_end(key)
+        while len(self._data) > maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+cache = EtagCache()
@@ -0,0 +1,58 @@
+import asyncio
+import atexit
+from typing import Optional
+
+import httpx
+
+from . import config
+
+DISCOGS_BASE_URL = "https://api.discogs.com"
+
+_client: Optional[httpx.AsyncClient] = None
+_client_lock = asyncio.Lock()
+
+
+async def get_client() -> httpx.AsyncClient:
+    """Return the worker-wide AsyncClient, creating it on first use.
+
+    A single client keeps the connection pool (and TLS sessions) to Discogs warm
+    across invocations instead of paying a fresh handshake per request.
+    """
+    global _client
+    if _client is not None:
+        return _client
+    async with _client_lock:
+        if _client is None:
+            _client = httpx.AsyncClient(
+                base_url=DISCOGS_BASE_URL,
+                timeout=httpx.Timeout(15.0, connect=5.0),
+                headers=config.BASE_HEADERS,
+                # Pool settings live on the transport when one is passed explicitly.
+                # retries=1 re-attempts failed connects only; request-level retries are in proxy_request.
+                transport=httpx.AsyncHTTPTransport(
+                    # Multiplex concurrent invocations over one connection (needs the h2 extra)
+                    http2=True,
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                    retries=1,
+                ),
+            )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    client, _client = _client, None
+    if client is not None:
+        await client.aclose()
+
+
+@atexit.register
+def _close_on_exit() -> None:
+    # The worker's event loop is gone by the time atexit runs; close on a fresh one.
+    if _client is None:
+        return
+    try:
+        asyncio.run(close_client())
+    except Exception:
+        # Best effort only; the process is exiting anyway
+        pass
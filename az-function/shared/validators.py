@@ -0,0 +1,29 @@
+from typing import Dict, Optional
+
+import azure.functions as func
+
+# 400 responses keyed by (kind, route param name); bodies never vary so build each once
+_ERR_CACHE: Dict[str, func.HttpResponse] = {}
+
+
+def _cached_error(key: str, message: str) -> func.HttpResponse:
+    err = _ERR_CACHE.get(key)
+    if err is None:
+        body = f'{{"error":"{message}"}}'.encode()
+        err = _ERR_CACHE[key] = func.HttpResponse(status_code=400, mimetype="application/json", body=body)
+    return err
+
+
+def require_param(req: func.HttpRequest, name: str) -> Optional[func.HttpResponse]:
+    """Return None if route param ``name`` is present, else a cached 400 response."""
+    if req.route_params.get(name):
+        return None
+    return _cached_error("required:" + name, f"{name} is required")
+
+
+def require_int(req: func.HttpRequest, name: str) -> Optional[func.HttpResponse]:
+    """Return None if route param ``name`` is an integer, else a cached 400 response."""
+    value = req.route_params.get(name)
+    if value and value.isdigit():
+        return None
+    return _cached_error("int:" + name, f"{name} must be an integer")